@@ -2,13 +2,26 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 
-from .umbrel_api import UmbrelApiClient
-from .const import DOMAIN
+from .umbrel_api import UmbrelApiClient, normalize_host
+from .const import (
+    CONF_POLL_2FA,
+    CONF_POLL_BACKUPS,
+    CONF_POLL_EXTERNAL_DEVICES,
+    CONF_POLL_UPDATES,
+    DATA_SCHEDULER,
+    DOMAIN,
+    MAX_CONCURRENT_REQUESTS,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
 from .coordinator import UmbrelCoordinator
+from .scheduler import UmbrelScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,6 +33,48 @@ PLATFORMS: list[Platform] = [
     Platform.UPDATE
 ]
 
+APP_ENTITY_KEYS = ("app", "app_restart", "app_update", "app_memory", "app_cpu")
+
+GROUP_ENTITIES = {
+    CONF_POLL_UPDATES: (
+        "umbrel_update_available",
+        "umbrel_system_update",
+        "umbrel_check_update",
+    ),
+    CONF_POLL_2FA: ("umbrel_2fa_enabled",),
+    CONF_POLL_BACKUPS: ("umbrel_backup_in_progress",),
+}
+
+EXTERNAL_DEVICE_PREFIX = "umbrel_storage_"
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    if entry.version == 1:
+
+        @callback
+        def _migrate_unique_id(entity_entry: er.RegistryEntry) -> dict | None:
+            if entity_entry.unique_id.startswith("umbrel_"):
+                return {"new_unique_id": f"{entry.entry_id}_{entity_entry.unique_id}"}
+            return None
+
+        await er.async_migrate_entries(hass, entry.entry_id, _migrate_unique_id)
+
+        device_registry = dr.async_get(hass)
+        device = device_registry.async_get_device(identifiers={(DOMAIN, "system")})
+        if device is not None and entry.entry_id in device.config_entries:
+            device_registry.async_update_device(
+                device.id, new_identifiers={(DOMAIN, entry.entry_id)}
+            )
+
+        unique_id = normalize_host(entry.data[CONF_HOST])
+        if any(
+            other.unique_id == unique_id
+            for other in hass.config_entries.async_entries(DOMAIN)
+        ):
+            unique_id = entry.unique_id
+        hass.config_entries.async_update_entry(entry, unique_id=unique_id, version=2)
+
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
@@ -27,33 +82,80 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     password = entry.data[CONF_PASSWORD]
     session = async_get_clientsession(hass)
 
-    client = UmbrelApiClient(host, password, session)
-    
-
-    try:
-        if not await client.login():
-            _LOGGER.error("Could not log in to Umbrel: Invalid credentials or host")
-            return False
-    except Exception as ex:
-        _LOGGER.error("Error connecting to Umbrel at %s: %s", host, ex)
-        raise ConfigEntryNotReady(f"Timeout while connecting to {host}") from ex
-
-    coordinator = UmbrelCoordinator(hass, client)
-    
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as ex:
-        _LOGGER.error("Error fetching initial data from Umbrel: %s", ex)
-        raise ConfigEntryNotReady(f"Error fetching initial data: {ex}") from ex
+    scheduler = hass.data.setdefault(
+        DATA_SCHEDULER, UmbrelScheduler(MAX_CONCURRENT_REQUESTS)
+    )
+    client = UmbrelApiClient(host, password, session, scheduler.semaphore)
+
+    if not scheduler.register(entry.entry_id, client.host):
+        _LOGGER.error("Umbrel at %s is already configured by another entry", client.host)
+        return False
+    entry.async_on_unload(lambda: scheduler.unregister(entry.entry_id))
+
+    coordinator = UmbrelCoordinator(hass, client, entry, scheduler)
+
+    has_snapshot = await coordinator.async_load_snapshot()
+
+    if not has_snapshot:
+        try:
+            if not await client.login():
+                _LOGGER.error("Could not log in to Umbrel: Invalid credentials or host")
+                return False
+        except Exception as ex:
+            _LOGGER.error("Error connecting to Umbrel at %s: %s", host, ex)
+            raise ConfigEntryNotReady(f"Timeout while connecting to {host}") from ex
+
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception as ex:
+            _LOGGER.error("Error fetching initial data from Umbrel: %s", ex)
+            raise ConfigEntryNotReady(f"Error fetching initial data: {ex}") from ex
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    _async_remove_disabled_entities(hass, entry, coordinator)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    if has_snapshot:
+        _LOGGER.debug("Set up Umbrel at %s from stored snapshot, refreshing in its slot", host)
+        coordinator.async_schedule_first_refresh()
 
     return True
 
+@callback
+def _async_remove_disabled_entities(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: UmbrelCoordinator
+) -> None:
+    unwanted = set()
+    for app_id in coordinator.apps_by_id:
+        if not coordinator.app_enabled(app_id):
+            unwanted.update(
+                coordinator.unique_id(f"umbrel_{key}_{app_id}") for key in APP_ENTITY_KEYS
+            )
+    for option, unique_ids in GROUP_ENTITIES.items():
+        if not coordinator.polls(option):
+            unwanted.update(coordinator.unique_id(unique_id) for unique_id in unique_ids)
+
+    device_prefix = None
+    if not coordinator.polls(CONF_POLL_EXTERNAL_DEVICES):
+        device_prefix = coordinator.unique_id(EXTERNAL_DEVICE_PREFIX)
+
+    registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if entity.unique_id in unwanted or (
+            device_prefix is not None and entity.unique_id.startswith(device_prefix)
+        ):
+            registry.async_remove(entity.entity_id)
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
 
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}").async_remove()
@@ -3,11 +3,12 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import CONF_POLL_2FA, CONF_POLL_BACKUPS, CONF_POLL_UPDATES, DOMAIN
 from .coordinator import UmbrelCoordinator
 
 async def async_setup_entry(
@@ -17,11 +18,14 @@ async def async_setup_entry(
 ) -> None:
     coordinator = hass.data[DOMAIN][entry.entry_id]
     
-    entities = [
-        UmbrelUpdateBinarySensor(coordinator),
-        Umbrel2faBinarySensor(coordinator),
-        UmbrelBackupBinarySensor(coordinator),
-    ]
+    entities = [UmbrelStaleBinarySensor(coordinator)]
+
+    if coordinator.polls(CONF_POLL_UPDATES):
+        entities.append(UmbrelUpdateBinarySensor(coordinator))
+    if coordinator.polls(CONF_POLL_2FA):
+        entities.append(Umbrel2faBinarySensor(coordinator))
+    if coordinator.polls(CONF_POLL_BACKUPS):
+        entities.append(UmbrelBackupBinarySensor(coordinator))
     
     async_add_entities(entities)
 
@@ -33,11 +37,11 @@ class UmbrelBinarySensorBase(CoordinatorEntity, BinarySensorEntity):
 
     @property
     def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, "system")},
-            "name": "Umbrel System",
-            "manufacturer": "Umbrel",
-        }
+        return self.coordinator.device_info
+
+    @property
+    def unique_id(self) -> str:
+        return self.coordinator.unique_id(self._attr_unique_id)
 
 class UmbrelUpdateBinarySensor(UmbrelBinarySensorBase):
 
@@ -77,4 +81,19 @@ class UmbrelBackupBinarySensor(UmbrelBinarySensorBase):
     @property
     def is_on(self) -> bool:
         progress_list = self.coordinator.data.get("backup_progress", [])
-        return any(p.get("status") == "In Progress" for p in progress_list)
\ No newline at end of file
+        return any(p.get("status") == "In Progress" for p in progress_list)
+
+class UmbrelStaleBinarySensor(UmbrelBinarySensorBase):
+
+    _attr_translation_key = "stale_data"
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_unique_id = "umbrel_stale_data"
+
+    @property
+    def is_on(self) -> bool:
+        return self.coordinator.stale
+
+    @property
+    def extra_state_attributes(self):
+        return {"snapshot_time": self.coordinator.snapshot_time}
\ No newline at end of file
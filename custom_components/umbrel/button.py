@@ -4,7 +4,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import CONF_POLL_UPDATES, DOMAIN
 from .coordinator import UmbrelCoordinator
 
 async def async_setup_entry(
@@ -17,11 +17,15 @@ async def async_setup_entry(
     entities = [
         UmbrelRebootButton(coordinator),
         UmbrelShutdownButton(coordinator),
-        UmbrelCheckUpdateButton(coordinator),
     ]
 
+    if coordinator.polls(CONF_POLL_UPDATES):
+        entities.append(UmbrelCheckUpdateButton(coordinator))
+
     apps = coordinator.data.get("apps", [])
     for app in apps:
+        if not coordinator.app_enabled(app.get("id")):
+            continue
         entities.append(UmbrelAppRestartButton(coordinator, app))
         entities.append(UmbrelAppUpdateButton(coordinator, app))
     
@@ -35,11 +39,11 @@ class UmbrelButtonBase(CoordinatorEntity, ButtonEntity):
 
     @property
     def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, "system")},
-            "name": "Umbrel System",
-            "manufacturer": "Umbrel",
-        }
+        return self.coordinator.device_info
+
+    @property
+    def unique_id(self) -> str:
+        return self.coordinator.unique_id(self._attr_unique_id)
 
 class UmbrelRebootButton(UmbrelButtonBase):
 
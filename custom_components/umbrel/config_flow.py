@@ -4,10 +4,26 @@ from typing import Any, Dict, Optional
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD
+from homeassistant.core import callback
+from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .umbrel_api import UmbrelApiClient
-from .const import DOMAIN, DEFAULT_NAME
+from .umbrel_api import UmbrelApiClient, normalize_host
+from .coordinator import deadband_settings
+from .const import (
+    CONF_APPS,
+    CONF_DEADBAND_MAX_AGE,
+    CONF_DEADBANDS,
+    CONF_EXCLUDED_APPS,
+    CONF_POLL_2FA,
+    CONF_POLL_BACKUPS,
+    CONF_POLL_EXTERNAL_DEVICES,
+    CONF_POLL_UPDATES,
+    DEFAULT_DEADBANDS,
+    DOMAIN,
+    DEFAULT_NAME,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,21 +36,31 @@ DATA_SCHEMA = vol.Schema(
 
 class UmbrelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
-    VERSION = 1
+    VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        return UmbrelOptionsFlow(config_entry)
 
     async def async_step_user(
         self, user_input: Optional[Dict[str, Any]] = None
-    ) -> config_entries.ConfigEntry:
+    ) -> FlowResult:
         errors = {}
 
         if user_input is not None:
+            await self.async_set_unique_id(normalize_host(user_input[CONF_HOST]))
+            self._abort_if_unique_id_configured()
+
             session = async_get_clientsession(self.hass)
             client = UmbrelApiClient(user_input[CONF_HOST], user_input[CONF_PASSWORD], session)
 
             try:
                 if await client.login():
                     return self.async_create_entry(
-                        title=DEFAULT_NAME, data=user_input
+                        title=f"{DEFAULT_NAME} ({user_input[CONF_HOST]})", data=user_input
                     )
                 else:
                     errors["base"] = "invalid_auth"
@@ -44,4 +70,81 @@ class UmbrelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="user", data_schema=DATA_SCHEMA, errors=errors
-        )
\ No newline at end of file
+        )
+
+class UmbrelOptionsFlow(config_entries.OptionsFlow):
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+        self._options = {}
+
+    async def async_step_init(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        options = self._entry.options
+
+        excluded = options.get(CONF_EXCLUDED_APPS, [])
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self._entry.entry_id)
+        apps = {}
+        if coordinator is not None and coordinator.data:
+            apps = {
+                app["id"]: app.get("name", app["id"])
+                for app in coordinator.data.get("apps", [])
+                if "id" in app
+            }
+
+        if user_input is not None:
+            selected = user_input.pop(CONF_APPS, None)
+            self._options = {**options, **user_input}
+            self._options.pop(CONF_APPS, None)
+            if apps and selected is not None:
+                self._options[CONF_EXCLUDED_APPS] = [
+                    app_id for app_id in excluded if app_id not in apps
+                ] + [app_id for app_id in apps if app_id not in selected]
+            return await self.async_step_deadbands()
+
+        fields = {
+            vol.Optional(CONF_POLL_UPDATES, default=options.get(CONF_POLL_UPDATES, True)): bool,
+            vol.Optional(CONF_POLL_2FA, default=options.get(CONF_POLL_2FA, True)): bool,
+            vol.Optional(CONF_POLL_BACKUPS, default=options.get(CONF_POLL_BACKUPS, True)): bool,
+            vol.Optional(
+                CONF_POLL_EXTERNAL_DEVICES,
+                default=options.get(CONF_POLL_EXTERNAL_DEVICES, True),
+            ): bool,
+        }
+        if apps:
+            selected = [app_id for app_id in apps if app_id not in excluded]
+            fields[vol.Optional(CONF_APPS, default=selected)] = cv.multi_select(apps)
+
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(fields))
+
+    async def async_step_deadbands(
+        self, user_input: Optional[Dict[str, Any]] = None
+    ) -> FlowResult:
+        options = self._entry.options
+
+        if user_input is not None:
+            self._options[CONF_DEADBAND_MAX_AGE] = user_input.pop(CONF_DEADBAND_MAX_AGE)
+            self._options[CONF_DEADBANDS] = {
+                key: {
+                    "absolute": user_input[f"{key}_absolute"],
+                    "relative": user_input[f"{key}_relative"],
+                }
+                for key in DEFAULT_DEADBANDS
+            }
+            return self.async_create_entry(title="", data=self._options)
+
+        fields = {}
+        for key in DEFAULT_DEADBANDS:
+            band = deadband_settings(options, key)
+            for kind in ("absolute", "relative"):
+                fields[vol.Optional(f"{key}_{kind}", default=band.get(kind, 0.0))] = vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                )
+        fields[
+            vol.Optional(
+                CONF_DEADBAND_MAX_AGE, default=deadband_settings(options, "")["max_age"]
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0))
+
+        return self.async_show_form(step_id="deadbands", data_schema=vol.Schema(fields))
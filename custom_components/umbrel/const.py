@@ -5,4 +5,71 @@ CONF_PASSWORD = "password"
 
 DEFAULT_NAME = "Umbrel"
 
-UPDATE_INTERVAL = 30
\ No newline at end of file
+UPDATE_INTERVAL = 30
+
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+MAX_CONCURRENT_REQUESTS = 8
+FLEET_SLOTS = 12
+MIN_SLOT_GAP = 1
+
+TIMEOUT_FLOOR = 3
+TIMEOUT_CEILING = 30
+WRITE_TIMEOUT = 120
+LOGIN_TIMEOUT = 10
+TIMEOUT_PERCENTILE = 0.95
+TIMEOUT_MULTIPLIER = 3
+LATENCY_WINDOW = 50
+LATENCY_MIN_SAMPLES = 5
+
+CONF_DEADBANDS = "deadbands"
+CONF_DEADBAND_MAX_AGE = "deadband_max_age"
+CONF_APPS = "apps"
+CONF_EXCLUDED_APPS = "excluded_apps"
+CONF_POLL_2FA = "poll_2fa"
+CONF_POLL_BACKUPS = "poll_backups"
+CONF_POLL_EXTERNAL_DEVICES = "poll_external_devices"
+CONF_POLL_UPDATES = "poll_updates"
+
+DEFAULT_DEADBANDS = {
+    "cpu_usage": {"absolute": 2.0},
+    "memory_usage": {"absolute": 1.0},
+    "disk_usage": {"absolute": 0.5},
+    "app_memory": {"relative": 0.05},
+    "app_cpu": {"absolute": 1.0},
+    "storage_growth": {"absolute": 0.01, "relative": 0.05},
+    "time_to_full": {"relative": 0.05},
+}
+
+DEADBAND_MAX_AGE = 900
+
+BOOT_TIME_TOLERANCE = 60
+
+TOP_CONSUMERS_COUNT = 5
+
+TRANSITIONAL_APP_STATES = {
+    "installing",
+    "uninstalling",
+    "starting",
+    "stopping",
+    "restarting",
+    "updating",
+}
+TRANSITION_POLL_INTERVAL = 5
+APP_STATE_CONCURRENCY = 4
+
+TREND_WINDOW = 86400
+TREND_SAMPLE_INTERVAL = 300
+TREND_MIN_SAMPLES = 6
+
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+STORAGE_VERSION = 1
+
+SNAPSHOT_SAVE_DELAY = 10
+SNAPSHOT_SAVE_INTERVAL = 300
+
+EVENT_APP_STATE_CHANGED = f"{DOMAIN}_app_state_changed"
+EVENT_APP_INSTALLED = f"{DOMAIN}_app_installed"
+EVENT_APP_REMOVED = f"{DOMAIN}_app_removed"
+EVENT_UPDATE_AVAILABLE = f"{DOMAIN}_update_available"
+EVENT_EXTERNAL_DEVICE_ATTACHED = f"{DOMAIN}_external_device_attached"
+EVENT_EXTERNAL_DEVICE_DETACHED = f"{DOMAIN}_external_device_detached"
@@ -1,43 +1,346 @@
 import asyncio
 from datetime import timedelta
 import logging
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
 from .umbrel_api import UmbrelApiClient
-from .const import DOMAIN, UPDATE_INTERVAL
+from .const import (
+    APP_STATE_CONCURRENCY,
+    BOOT_TIME_TOLERANCE,
+    CONF_DEADBAND_MAX_AGE,
+    CONF_DEADBANDS,
+    CONF_EXCLUDED_APPS,
+    CONF_POLL_2FA,
+    CONF_POLL_BACKUPS,
+    CONF_POLL_EXTERNAL_DEVICES,
+    CONF_POLL_UPDATES,
+    DEADBAND_MAX_AGE,
+    DEFAULT_DEADBANDS,
+    DOMAIN,
+    EVENT_APP_INSTALLED,
+    EVENT_APP_REMOVED,
+    EVENT_APP_STATE_CHANGED,
+    EVENT_EXTERNAL_DEVICE_ATTACHED,
+    EVENT_EXTERNAL_DEVICE_DETACHED,
+    EVENT_UPDATE_AVAILABLE,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_SAVE_INTERVAL,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    TRANSITION_POLL_INTERVAL,
+    TRANSITIONAL_APP_STATES,
+    TREND_MIN_SAMPLES,
+    TREND_SAMPLE_INTERVAL,
+    TREND_WINDOW,
+)
+from .scheduler import UmbrelScheduler
+from .trend import CapacityTrend
 
 _LOGGER = logging.getLogger(__name__)
 
+def disk_usage(usage) -> tuple:
+    if not isinstance(usage, dict):
+        return None, None
+    used = usage.get("used") or usage.get("totalUsed")
+    total = usage.get("total") or usage.get("size")
+    return used, total
+
+def _usage_by_app(usage) -> dict:
+    if not isinstance(usage, dict):
+        return {}
+    return {app["id"]: app.get("used") for app in usage.get("apps", []) if "id" in app}
+
+def deadband_settings(options, key: str) -> dict:
+    band = {
+        "max_age": options.get(CONF_DEADBAND_MAX_AGE, DEADBAND_MAX_AGE),
+        **DEFAULT_DEADBANDS.get(key, {}),
+    }
+    band.update(options.get(CONF_DEADBANDS, {}).get(key, {}))
+    return band
+
+def _boot_time(uptime, previous: str | None) -> str | None:
+    try:
+        boot_time = dt_util.utcnow() - timedelta(seconds=float(uptime))
+    except (TypeError, ValueError):
+        return previous
+
+    previous_time = dt_util.parse_datetime(previous) if previous else None
+    if previous_time is not None and abs((boot_time - previous_time).total_seconds()) <= BOOT_TIME_TOLERANCE:
+        return previous
+    return boot_time.replace(microsecond=0).isoformat()
+
+def _is_transitional(app: dict) -> bool:
+    return str(app.get("state", "")).lower() in TRANSITIONAL_APP_STATES
+
 class UmbrelCoordinator(DataUpdateCoordinator):
 
     def __init__(
         self,
         hass: HomeAssistant,
         client: UmbrelApiClient,
+        entry: ConfigEntry,
+        scheduler: UmbrelScheduler,
     ) -> None:
         self.client = client
+        self.entry = entry
+        self.stale = False
+        self.snapshot_time = None
+        self.apps_by_id = {}
+        self.app_cpu = {}
+        self.app_memory = {}
+        self.storage_trends = {}
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}")
+        self._last_save = None
+        self._scheduler = scheduler
+        self._unsub_slot = None
+        self._stopped = False
+        self._unsub_transition_poll = None
+        entry.async_on_unload(self._stop_slots)
+        entry.async_on_unload(self._cancel_transition_poll)
         super().__init__(
             hass=hass,
             logger=_LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            name=f"{DOMAIN} {client.host}",
+            update_interval=None,
         )
 
+    @property
+    def device_info(self) -> dict:
+        return {
+            "identifiers": {(DOMAIN, self.entry.entry_id)},
+            "name": self.entry.title,
+            "manufacturer": "Umbrel",
+            "model": (self.data or {}).get("system", {}).get("version", "Unknown"),
+            "configuration_url": self.client.host,
+        }
+
+    def unique_id(self, key: str) -> str:
+        return f"{self.entry.entry_id}_{key}"
+
+    @callback
+    def async_schedule_first_refresh(self) -> None:
+        self._schedule_slot()
+
+    @callback
+    def _schedule_slot(self) -> None:
+        self._cancel_slot()
+        if self._stopped:
+            return
+        delay = self._scheduler.next_delay(self.entry.entry_id, time.time())
+        self._unsub_slot = async_call_later(self.hass, delay, self._async_slot_refresh)
+
+    @callback
+    def _cancel_slot(self) -> None:
+        if self._unsub_slot is not None:
+            self._unsub_slot()
+            self._unsub_slot = None
+
+    @callback
+    def _stop_slots(self) -> None:
+        self._stopped = True
+        self._cancel_slot()
+
+    async def _async_slot_refresh(self, _now) -> None:
+        self._unsub_slot = None
+        await self.async_refresh()
+
+    async def async_load_snapshot(self) -> bool:
+        stored = await self._store.async_load()
+        if not stored or not stored.get("data"):
+            return False
+
+        self.data = stored["data"]
+        self._build_indexes(self.data)
+        self.snapshot_time = stored.get("saved_at")
+        for volume, samples in stored.get("trends", {}).items():
+            self.storage_trend(volume).load(samples)
+        self.stale = True
+        return True
+
+    @callback
+    def _snapshot(self) -> dict:
+        return {
+            "saved_at": self.snapshot_time,
+            "data": self.data,
+            "trends": {
+                volume: trend.as_list() for volume, trend in self.storage_trends.items()
+            },
+        }
+
+    def storage_trend(self, volume: str) -> CapacityTrend:
+        if volume not in self.storage_trends:
+            self.storage_trends[volume] = CapacityTrend(
+                TREND_WINDOW, TREND_SAMPLE_INTERVAL, TREND_MIN_SAMPLES
+            )
+        return self.storage_trends[volume]
+
+    @callback
+    def _update_trends(self, data: dict) -> None:
+        used, _ = disk_usage((data.get("system") or {}).get("disk"))
+        if used is not None:
+            self.storage_trend("system").add(time.time(), used)
+
+    @callback
+    def _build_indexes(self, data: dict) -> None:
+        system = data.get("system") or {}
+        self.apps_by_id = {app["id"]: app for app in data.get("apps", []) if "id" in app}
+        self.app_cpu = _usage_by_app(system.get("cpu_usage"))
+        self.app_memory = _usage_by_app(system.get("memory"))
+
+    @callback
+    def _fire_events(self, old: dict, new: dict) -> None:
+        self._fire_app_events(old.get("apps") or [], new.get("apps") or [])
+
+        old_update = old.get("update") or {}
+        new_update = new.get("update") or {}
+        if new_update.get("available") and not old_update.get("available"):
+            self._fire(
+                EVENT_UPDATE_AVAILABLE,
+                version=new_update.get("version"),
+                name=new_update.get("name"),
+            )
+
+        if not self.polls(CONF_POLL_EXTERNAL_DEVICES):
+            return
+
+        old_devices = {d.get("id"): d for d in old.get("external_devices") or []}
+        new_devices = {d.get("id"): d for d in new.get("external_devices") or []}
+        for device_id in new_devices.keys() - old_devices.keys():
+            self._fire(
+                EVENT_EXTERNAL_DEVICE_ATTACHED,
+                device_id=device_id,
+                name=new_devices[device_id].get("name"),
+            )
+        for device_id in old_devices.keys() - new_devices.keys():
+            self._fire(
+                EVENT_EXTERNAL_DEVICE_DETACHED,
+                device_id=device_id,
+                name=old_devices[device_id].get("name"),
+            )
+
+    @callback
+    def _fire_app_events(self, old_apps: list, new_apps: list) -> None:
+        old_by_id = {app.get("id"): app for app in old_apps}
+        new_by_id = {app.get("id"): app for app in new_apps}
+
+        for app_id, app in new_by_id.items():
+            previous = old_by_id.get(app_id)
+            if previous is None:
+                self._fire(EVENT_APP_INSTALLED, app_id=app_id, name=app.get("name", app_id))
+            elif previous.get("state") != app.get("state"):
+                self._fire(
+                    EVENT_APP_STATE_CHANGED,
+                    app_id=app_id,
+                    name=app.get("name", app_id),
+                    old_state=previous.get("state"),
+                    new_state=app.get("state"),
+                )
+
+        for app_id in old_by_id.keys() - new_by_id.keys():
+            app = old_by_id[app_id]
+            self._fire(EVENT_APP_REMOVED, app_id=app_id, name=app.get("name", app_id))
+
+    @callback
+    def _fire(self, event_type: str, **data) -> None:
+        self.hass.bus.async_fire(event_type, {"entry_id": self.entry.entry_id, **data})
+
+    async def _async_merge_app_states(self, apps: list) -> list:
+        busy = [
+            app["id"]
+            for app in apps
+            if "id" in app and self.app_enabled(app["id"]) and _is_transitional(app)
+        ]
+        if not busy:
+            return apps
+
+        semaphore = asyncio.Semaphore(APP_STATE_CONCURRENCY)
+
+        async def fetch(app_id: str) -> dict:
+            async with semaphore:
+                return await self.client.get_app_state(app_id)
+
+        states = await asyncio.gather(*(fetch(app_id) for app_id in busy))
+        fresh = {app_id: state for app_id, state in zip(busy, states) if state}
+        return [
+            {**app, **fresh[app["id"]]} if app.get("id") in fresh else app
+            for app in apps
+        ]
+
+    @callback
+    def _schedule_transition_poll(self, apps: list) -> None:
+        if self._stopped or self._unsub_transition_poll is not None:
+            return
+        if any(self.app_enabled(app.get("id")) and _is_transitional(app) for app in apps):
+            self._unsub_transition_poll = async_call_later(
+                self.hass, TRANSITION_POLL_INTERVAL, self._async_poll_transitional
+            )
+
+    @callback
+    def _cancel_transition_poll(self) -> None:
+        if self._unsub_transition_poll is not None:
+            self._unsub_transition_poll()
+            self._unsub_transition_poll = None
+
+    async def _async_poll_transitional(self, _now) -> None:
+        self._unsub_transition_poll = None
+        old_apps = self.data.get("apps", [])
+        apps = await self._async_merge_app_states(old_apps)
+        if self._stopped or apps is old_apps or self.data.get("apps") is not old_apps:
+            return
+
+        self._fire_app_events(old_apps, apps)
+        self.data = {**self.data, "apps": apps}
+        self._build_indexes(self.data)
+        self.async_update_listeners()
+        self._schedule_transition_poll(apps)
+
+    def polls(self, option: str) -> bool:
+        return self.entry.options.get(option, True)
+
+    def app_enabled(self, app_id: str) -> bool:
+        return app_id not in self.entry.options.get(CONF_EXCLUDED_APPS, [])
+
+    async def _poll(self, option: str, fetch, default):
+        if not self.polls(option):
+            return default
+        return await fetch()
+
+    def deadband(self, key: str) -> dict:
+        return deadband_settings(self.entry.options, key)
+
     async def _async_update_data(self):
+        try:
+            return await self._async_fetch()
+        finally:
+            self._schedule_slot()
+
+    async def _async_fetch(self):
+        try:
+            logged_in = await self.client.ensure_login()
+        except Exception as err:
+            raise UpdateFailed(f"Error connecting to Umbrel: {err}") from err
+        if not logged_in:
+            raise UpdateFailed("Could not log in to Umbrel: invalid credentials")
+
         try:
 
             system_info, apps, update_info, is_2fa_enabled, external_devices, backup_progress = await asyncio.gather(
                 self.client.get_system_info(),
                 self.client.get_apps(),
-                self.client.check_update(),
-                self.client.is_2fa_enabled(),
-                self.client.get_external_devices(),
-                self.client.get_backup_progress(),
+                self._poll(CONF_POLL_UPDATES, self.client.check_update, {"available": False}),
+                self._poll(CONF_POLL_2FA, self.client.is_2fa_enabled, False),
+                self._poll(CONF_POLL_EXTERNAL_DEVICES, self.client.get_external_devices, []),
+                self._poll(CONF_POLL_BACKUPS, self.client.get_backup_progress, []),
                 return_exceptions=True
             )
             
@@ -45,15 +348,22 @@ class UmbrelCoordinator(DataUpdateCoordinator):
             if isinstance(system_info, Exception): 
                 _LOGGER.warning("Error fetching system info: %s", system_info)
                 system_info = {}
+            if system_info:
+                system_info["boot_time"] = _boot_time(
+                    system_info.get("uptime"),
+                    ((self.data or {}).get("system") or {}).get("boot_time"),
+                )
             if isinstance(apps, Exception): 
                 _LOGGER.warning("Error fetching apps: %s", apps)
-                apps = []
+                apps = (self.data or {}).get("apps", [])
             if isinstance(update_info, Exception): update_info = {"available": False}
             if isinstance(is_2fa_enabled, Exception): is_2fa_enabled = False
-            if isinstance(external_devices, Exception): external_devices = []
+            if isinstance(external_devices, Exception): external_devices = (self.data or {}).get("external_devices", [])
             if isinstance(backup_progress, Exception): backup_progress = []
 
-            return {
+            apps = await self._async_merge_app_states(apps)
+
+            data = {
                 "system": system_info,
                 "apps": apps,
                 "update": update_info,
@@ -62,4 +372,21 @@ class UmbrelCoordinator(DataUpdateCoordinator):
                 "backup_progress": backup_progress
             }
         except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}")
\ No newline at end of file
+            raise UpdateFailed(f"Error communicating with API: {err}")
+
+        if not system_info:
+            raise UpdateFailed("Error fetching system info")
+
+        if self.data is not None:
+            self._fire_events(self.data, data)
+        self._build_indexes(data)
+        self._update_trends(data)
+        self.stale = False
+        self.snapshot_time = dt_util.utcnow().isoformat()
+        now = time.monotonic()
+        if self._last_save is None or now - self._last_save >= SNAPSHOT_SAVE_INTERVAL:
+            self._last_save = now
+            self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+
+        self._schedule_transition_poll(apps)
+        return data
@@ -0,0 +1,36 @@
+import asyncio
+
+from .const import FLEET_SLOTS, MIN_SLOT_GAP, UPDATE_INTERVAL
+
+
+class UmbrelScheduler:
+
+    def __init__(self, max_concurrent_requests: int) -> None:
+        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._hosts = {}
+        self._slots = {}
+
+    def register(self, entry_id: str, host: str) -> bool:
+        for other_id, other_host in self._hosts.items():
+            if other_host == host and other_id != entry_id:
+                return False
+
+        self._hosts[entry_id] = host
+        if entry_id not in self._slots:
+            used = set(self._slots.values())
+            self._slots[entry_id] = next(slot for slot in range(len(used) + 1) if slot not in used)
+        return True
+
+    def unregister(self, entry_id: str) -> None:
+        self._hosts.pop(entry_id, None)
+        self._slots.pop(entry_id, None)
+
+    def offset(self, entry_id: str) -> float:
+        slot = self._slots.get(entry_id, 0)
+        return (slot % FLEET_SLOTS) * UPDATE_INTERVAL / FLEET_SLOTS
+
+    def next_delay(self, entry_id: str, now: float) -> float:
+        delay = (self.offset(entry_id) - now) % UPDATE_INTERVAL
+        if delay < MIN_SLOT_GAP:
+            delay += UPDATE_INTERVAL
+        return delay
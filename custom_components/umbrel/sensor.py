@@ -1,5 +1,6 @@
+import heapq
 import logging
-from datetime import datetime, timedelta
+import time
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -7,14 +8,18 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfTemperature, UnitOfInformation
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, UnitOfTemperature, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
-from .coordinator import UmbrelCoordinator
+from .const import (
+    CONF_POLL_EXTERNAL_DEVICES,
+    DOMAIN,
+    TOP_CONSUMERS_COUNT,
+)
+from .coordinator import UmbrelCoordinator, disk_usage
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,21 +36,33 @@ async def async_setup_entry(
         UmbrelDiskSensor(coordinator),
         UmbrelTempSensor(coordinator),
         UmbrelUptimeSensor(coordinator),
+        UmbrelTopCpuSensor(coordinator),
+        UmbrelStorageGrowthSensor(coordinator),
+        UmbrelStorageTimeToFullSensor(coordinator),
     ]
     
 
-    for device in coordinator.data.get("external_devices", []):
+    external_devices = coordinator.data.get("external_devices", [])
+    if not coordinator.polls(CONF_POLL_EXTERNAL_DEVICES):
+        external_devices = []
+
+    for device in external_devices:
         entities.append(UmbrelExternalDeviceSensor(coordinator, device))
 
-    apps_mem = coordinator.data.get("system", {}).get("memory", {}).get("apps", [])
-    if apps_mem:
+    for app_id in filter(coordinator.app_enabled, coordinator.app_memory):
+        entities.append(UmbrelAppMemorySensor(coordinator, app_id, _app_name(coordinator, app_id)))
 
-        app_names = {a["id"]: a.get("name", a["id"]) for a in coordinator.data.get("apps", [])}
-        for app_stat in apps_mem:
-            entities.append(UmbrelAppMemorySensor(coordinator, app_stat["id"], app_names.get(app_stat["id"], app_stat["id"])))
+    for app_id in filter(coordinator.app_enabled, coordinator.app_cpu):
+        entities.append(UmbrelAppCpuSensor(coordinator, app_id, _app_name(coordinator, app_id)))
 
     async_add_entities(entities)
 
+def _app_name(coordinator: UmbrelCoordinator, app_id: str) -> str:
+    return coordinator.apps_by_id.get(app_id, {}).get("name", app_id)
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
 class UmbrelSensorBase(CoordinatorEntity, SensorEntity):
 
     def __init__(self, coordinator: UmbrelCoordinator) -> None:
@@ -54,12 +71,56 @@ class UmbrelSensorBase(CoordinatorEntity, SensorEntity):
 
     @property
     def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, "system")},
-            "name": "Umbrel System",
-            "manufacturer": "Umbrel",
-            "model": self.coordinator.data["system"].get("version", "Unknown"),
-        }
+        return self.coordinator.device_info
+
+    @property
+    def unique_id(self) -> str:
+        return self.coordinator.unique_id(self._attr_unique_id)
+
+class UmbrelFilteredSensor(UmbrelSensorBase):
+
+    _deadband_key: str | None = None
+
+    def __init__(self, coordinator: UmbrelCoordinator) -> None:
+        super().__init__(coordinator)
+        self._published = None
+        self._published_at = 0.0
+        self._published_available = None
+
+    def _current_value(self):
+        return None
+
+    @property
+    def native_value(self):
+        return self._published
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._publish(self._current_value())
+
+    def _publish(self, value) -> None:
+        self._published = value
+        self._published_at = time.monotonic()
+        self._published_available = self.available
+
+    def _should_publish(self, value) -> bool:
+        old = self._published
+        if not _is_number(value) or not _is_number(old) or self._deadband_key is None:
+            return value != old
+
+        band = self.coordinator.deadband(self._deadband_key)
+        if time.monotonic() - self._published_at >= band["max_age"]:
+            return True
+
+        threshold = max(band.get("absolute", 0), band.get("relative", 0) * abs(old))
+        return abs(value - old) > threshold
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        value = self._current_value()
+        if self.available != self._published_available or self._should_publish(value):
+            self._publish(value)
+            self.async_write_ha_state()
 
 class UmbrelExternalDeviceSensor(UmbrelSensorBase):
 
@@ -90,15 +151,15 @@ class UmbrelExternalDeviceSensor(UmbrelSensorBase):
                 }
         return {}
 
-class UmbrelCpuSensor(UmbrelSensorBase):
+class UmbrelCpuSensor(UmbrelFilteredSensor):
 
     _attr_translation_key = "cpu_usage"
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_unique_id = "umbrel_cpu_usage"
+    _deadband_key = "cpu_usage"
 
-    @property
-    def native_value(self):
+    def _current_value(self):
         try:
              data = self.coordinator.data["system"].get("cpu_usage")
              if isinstance(data, dict):
@@ -109,15 +170,15 @@ class UmbrelCpuSensor(UmbrelSensorBase):
         except (KeyError, TypeError):
             return None
 
-class UmbrelMemorySensor(UmbrelSensorBase):
+class UmbrelMemorySensor(UmbrelFilteredSensor):
 
     _attr_translation_key = "memory_usage"
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_unique_id = "umbrel_memory_usage"
+    _deadband_key = "memory_usage"
 
-    @property
-    def native_value(self):
+    def _current_value(self):
         try:
             data = self.coordinator.data["system"].get("memory")
             if isinstance(data, dict):
@@ -132,15 +193,15 @@ class UmbrelMemorySensor(UmbrelSensorBase):
         except (KeyError, TypeError):
             return None
 
-class UmbrelDiskSensor(UmbrelSensorBase):
+class UmbrelDiskSensor(UmbrelFilteredSensor):
 
     _attr_translation_key = "disk_usage"
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_unique_id = "umbrel_disk_usage"
+    _deadband_key = "disk_usage"
 
-    @property
-    def native_value(self):
+    def _current_value(self):
         try:
             data = self.coordinator.data["system"].get("disk")
             if isinstance(data, dict):
@@ -173,28 +234,27 @@ class UmbrelTempSensor(UmbrelSensorBase):
         except (KeyError, TypeError):
             return None
 
-class UmbrelUptimeSensor(UmbrelSensorBase):
+class UmbrelUptimeSensor(UmbrelFilteredSensor):
 
     _attr_translation_key = "uptime"
     _attr_device_class = SensorDeviceClass.TIMESTAMP
     _attr_unique_id = "umbrel_uptime"
 
-    @property
-    def native_value(self):
+    def _current_value(self):
         try:
-            uptime_seconds = self.coordinator.data["system"].get("uptime")
-            if uptime_seconds is not None:
-                boot_time = dt_util.utcnow() - timedelta(seconds=float(uptime_seconds))
-                return boot_time
+            boot_time = self.coordinator.data["system"].get("boot_time")
+            if boot_time is not None:
+                return dt_util.parse_datetime(boot_time)
             return None
         except (KeyError, TypeError, ValueError):
             return None
 
-class UmbrelAppMemorySensor(UmbrelSensorBase):
+class UmbrelAppMemorySensor(UmbrelFilteredSensor):
 
     _attr_native_unit_of_measurement = UnitOfInformation.MEGABYTES
     _attr_device_class = SensorDeviceClass.DATA_SIZE
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _deadband_key = "app_memory"
 
     def __init__(self, coordinator: UmbrelCoordinator, app_id: str, app_name: str) -> None:
         super().__init__(coordinator)
@@ -202,14 +262,110 @@ class UmbrelAppMemorySensor(UmbrelSensorBase):
         self._attr_name = f"{app_name} Memory"
         self._attr_unique_id = f"umbrel_app_memory_{app_id}"
 
-    @property
-    def native_value(self):
+    def _current_value(self):
+        used = self.coordinator.app_memory.get(self.app_id)
+        if used is None:
+            return 0
         try:
-            apps_mem = self.coordinator.data["system"].get("memory", {}).get("apps", [])
-            for app in apps_mem:
-                if app["id"] == self.app_id:
+            return round(used / 1024 / 1024, 1)
+        except TypeError:
+            return None
+
+class UmbrelAppCpuSensor(UmbrelFilteredSensor):
+
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:cpu-64-bit"
+    _deadband_key = "app_cpu"
+
+    def __init__(self, coordinator: UmbrelCoordinator, app_id: str, app_name: str) -> None:
+        super().__init__(coordinator)
+        self.app_id = app_id
+        self._attr_name = f"{app_name} CPU"
+        self._attr_unique_id = f"umbrel_app_cpu_{app_id}"
 
-                    return round(app["used"] / 1024 / 1024, 1)
+    def _current_value(self):
+        used = self.coordinator.app_cpu.get(self.app_id)
+        if used is None:
             return 0
-        except (KeyError, TypeError):
-            return None
\ No newline at end of file
+        try:
+            return round(used, 1)
+        except TypeError:
+            return None
+
+class UmbrelTopCpuSensor(UmbrelFilteredSensor):
+
+    _attr_translation_key = "top_cpu_consumer"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:chart-bar"
+    _attr_unique_id = "umbrel_top_cpu_consumer"
+    _deadband_key = "app_cpu"
+
+    def __init__(self, coordinator: UmbrelCoordinator) -> None:
+        super().__init__(coordinator)
+        self._top = []
+        self._consumers = []
+
+    def _current_value(self):
+        usage = {
+            app_id: used
+            for app_id, used in self.coordinator.app_cpu.items()
+            if _is_number(used)
+        }
+        top = heapq.nlargest(TOP_CONSUMERS_COUNT, usage.items(), key=lambda item: item[1])
+        self._top = [
+            {"id": app_id, "name": _app_name(self.coordinator, app_id), "cpu": round(used, 1)}
+            for app_id, used in top
+        ]
+        return self._top[0]["cpu"] if self._top else None
+
+    def _should_publish(self, value) -> bool:
+        ranking = [consumer["id"] for consumer in self._top]
+        if ranking != [consumer["id"] for consumer in self._consumers]:
+            return True
+        return super()._should_publish(value)
+
+    def _publish(self, value) -> None:
+        super()._publish(value)
+        self._consumers = self._top
+
+    @property
+    def extra_state_attributes(self):
+        return {"consumers": self._consumers}
+
+class UmbrelStorageGrowthSensor(UmbrelFilteredSensor):
+
+    _attr_translation_key = "disk_growth"
+    _attr_native_unit_of_measurement = "GB/d"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:chart-line"
+    _attr_unique_id = "umbrel_disk_growth"
+    _deadband_key = "storage_growth"
+
+    def _current_value(self):
+        rate = self.coordinator.storage_trend("system").growth_rate
+        if rate is None:
+            return None
+        return round(rate * 86400 / 1e9, 2)
+
+class UmbrelStorageTimeToFullSensor(UmbrelFilteredSensor):
+
+    _attr_translation_key = "disk_time_to_full"
+    _attr_native_unit_of_measurement = UnitOfTime.DAYS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_icon = "mdi:harddisk-remove"
+    _attr_unique_id = "umbrel_disk_time_to_full"
+    _deadband_key = "time_to_full"
+
+    def _current_value(self):
+        try:
+            _, total = disk_usage(self.coordinator.data["system"].get("disk"))
+            if not total:
+                return None
+            seconds = self.coordinator.storage_trend("system").time_to_full(float(total))
+            if seconds is None:
+                return None
+            return round(seconds / 86400, 1)
+        except (KeyError, TypeError, ValueError):
+            return None
@@ -20,7 +20,8 @@ async def async_setup_entry(
     entities = []
     
     for app in apps:
-        entities.append(UmbrelAppSwitch(coordinator, app))
+        if coordinator.app_enabled(app.get("id")):
+            entities.append(UmbrelAppSwitch(coordinator, app))
     
     async_add_entities(entities)
 
@@ -35,11 +36,11 @@ class UmbrelAppSwitch(CoordinatorEntity, SwitchEntity):
 
     @property
     def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, "system")},
-            "name": "Umbrel System",
-            "manufacturer": "Umbrel",
-        }
+        return self.coordinator.device_info
+
+    @property
+    def unique_id(self) -> str:
+        return self.coordinator.unique_id(self._attr_unique_id)
 
     @property
     def is_on(self) -> bool:
@@ -0,0 +1,68 @@
+from collections import deque
+
+
+class CapacityTrend:
+
+    def __init__(self, window: float, min_interval: float, min_samples: int) -> None:
+        self._window = window
+        self._min_interval = min_interval
+        self._min_samples = min_samples
+        self._samples = deque()
+        self._reset_sums()
+
+    def _reset_sums(self) -> None:
+        self._origin = self._samples[0][0] if self._samples else None
+        self._sum_t = 0.0
+        self._sum_y = 0.0
+        self._sum_tt = 0.0
+        self._sum_ty = 0.0
+        for timestamp, used in self._samples:
+            self._accumulate(timestamp, used, 1)
+
+    def _accumulate(self, timestamp: float, used: float, sign: int) -> None:
+        t = timestamp - self._origin
+        self._sum_t += sign * t
+        self._sum_y += sign * used
+        self._sum_tt += sign * t * t
+        self._sum_ty += sign * t * used
+
+    def add(self, timestamp: float, used: float) -> None:
+        if self._samples and timestamp - self._samples[-1][0] < self._min_interval:
+            return
+
+        if not self._samples:
+            self._origin = timestamp
+        self._samples.append((timestamp, used))
+        self._accumulate(timestamp, used, 1)
+
+        while timestamp - self._samples[0][0] > self._window:
+            old_timestamp, old_used = self._samples.popleft()
+            self._accumulate(old_timestamp, old_used, -1)
+
+    @property
+    def latest(self) -> float | None:
+        return self._samples[-1][1] if self._samples else None
+
+    @property
+    def growth_rate(self) -> float | None:
+        n = len(self._samples)
+        if n < self._min_samples:
+            return None
+
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return (n * self._sum_ty - self._sum_t * self._sum_y) / denominator
+
+    def time_to_full(self, capacity: float) -> float | None:
+        rate = self.growth_rate
+        if rate is None or rate <= 0 or self.latest is None:
+            return None
+        return max(capacity - self.latest, 0) / rate
+
+    def as_list(self) -> list:
+        return [list(sample) for sample in self._samples]
+
+    def load(self, samples: list) -> None:
+        self._samples = deque((float(t), float(y)) for t, y in samples)
+        self._reset_sums()
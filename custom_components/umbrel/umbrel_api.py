@@ -1,27 +1,130 @@
+import asyncio
+from collections import deque
+import contextlib
 import json
 import logging
+import time
 import urllib.parse
 import aiohttp
 
+from .const import (
+    LATENCY_MIN_SAMPLES,
+    LATENCY_WINDOW,
+    LOGIN_TIMEOUT,
+    TIMEOUT_CEILING,
+    TIMEOUT_FLOOR,
+    TIMEOUT_MULTIPLIER,
+    TIMEOUT_PERCENTILE,
+    WRITE_TIMEOUT,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
+def normalize_host(host: str) -> str:
+    host = host.strip().rstrip("/")
+    if not host.startswith("http"):
+        host = f"http://{host}"
+    return host.lower()
+
+class UmbrelAuthError(Exception):
+    pass
+
+class LatencyTracker:
+
+    def __init__(self, window: int, min_samples: int) -> None:
+        self._window = window
+        self._min_samples = min_samples
+        self._samples = {}
+
+    def record(self, procedure: str, seconds: float) -> None:
+        if procedure not in self._samples:
+            self._samples[procedure] = deque(maxlen=self._window)
+        self._samples[procedure].append(seconds)
+
+    def percentile(self, procedure: str, q: float) -> float | None:
+        samples = self._samples.get(procedure)
+        if not samples or len(samples) < self._min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[round(q * (len(ordered) - 1))]
+
 class UmbrelApiClient:
 
-    def __init__(self, host: str, password: str, session: aiohttp.ClientSession) -> None:
+    def __init__(
+        self,
+        host: str,
+        password: str,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore | None = None,
+        timeout_floor: float = TIMEOUT_FLOOR,
+        timeout_ceiling: float = TIMEOUT_CEILING,
+        write_timeout: float = WRITE_TIMEOUT,
+        login_timeout: float = LOGIN_TIMEOUT,
+    ) -> None:
         self._session = session
-        self._host = host.rstrip("/")
-        if not self._host.startswith("http"):
-            self._host = f"http://{self._host}"
+        self._host = normalize_host(host)
         self._password = password
         self._token = None
+        self._semaphore = semaphore
+        self._login_lock = asyncio.Lock()
+        self._timeout_floor = timeout_floor
+        self._timeout_ceiling = timeout_ceiling
+        self._write_timeout = write_timeout
+        self._login_timeout = login_timeout
+        self._latency = LatencyTracker(LATENCY_WINDOW, LATENCY_MIN_SAMPLES)
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    def _slot(self):
+        return self._semaphore if self._semaphore is not None else contextlib.nullcontext()
+
+    def timeout_for(
+        self, procedure: str, write: bool = False, fallback: float | None = None
+    ) -> float:
+        if write:
+            return self._write_timeout
+
+        latency = self._latency.percentile(procedure, TIMEOUT_PERCENTILE)
+        if latency is None:
+            return fallback if fallback is not None else self._timeout_ceiling
+        return min(max(latency * TIMEOUT_MULTIPLIER, self._timeout_floor), self._timeout_ceiling)
+
+    @contextlib.asynccontextmanager
+    async def _call(
+        self, procedure: str, write: bool = False, fallback: float | None = None
+    ):
+        timeout = self.timeout_for(procedure, write, fallback)
+        async with self._slot():
+            start = time.monotonic()
+            try:
+                yield aiohttp.ClientTimeout(total=timeout)
+            except asyncio.TimeoutError as err:
+                if not write:
+                    self._latency.record(procedure, timeout)
+                raise asyncio.TimeoutError(
+                    f"Umbrel call {procedure} timed out after {timeout:.1f}s"
+                ) from err
+
+            if not write:
+                self._latency.record(procedure, time.monotonic() - start)
+
+    async def ensure_login(self) -> bool:
+        if self._token:
+            return True
+        async with self._login_lock:
+            if self._token:
+                return True
+            return await self.login()
 
     async def login(self) -> bool:
         url = f"{self._host}/trpc/user.login"
         payload = {"password": self._password}
 
         try:
-            async with self._session.post(
-                url, json=payload, ssl=False, timeout=10
+            async with self._call("user.login", fallback=self._login_timeout) as timeout, self._session.post(
+                url, json=payload, ssl=False, timeout=timeout
             ) as response:
                 if response.status == 200:
                     data = await response.json()
@@ -35,8 +138,8 @@ class UmbrelApiClient:
         return False
 
     async def _request(self, method: str, endpoint: str, params: dict = None) -> dict:
-        if not self._token:
-            await self.login()
+        if not await self.ensure_login():
+            raise UmbrelAuthError("Umbrel rejected the login credentials")
 
         headers = {
             "Authorization": f"Bearer {self._token}",
@@ -45,6 +148,7 @@ class UmbrelApiClient:
         }
 
         url = f"{self._host}{endpoint}"
+        procedure = endpoint.removeprefix("/trpc/")
 
         if method == "GET" and params:
             input_obj = {"json": params}
@@ -52,20 +156,16 @@ class UmbrelApiClient:
             url = f"{url}?input={encoded_input}"
             params = None
 
-        try:
-            async with self._session.request(
-                method,
-                url,
-                json=params if method == "POST" else None,
-                headers=headers,
-                ssl=False,
-                timeout=20,
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error communicating with Umbrel: %s", exception)
-            raise
+        async with self._call(procedure, method == "POST") as timeout, self._session.request(
+            method,
+            url,
+            json=params if method == "POST" else None,
+            headers=headers,
+            ssl=False,
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
 
     async def get_system_info(self) -> dict:
         data = {}
@@ -106,7 +206,8 @@ class UmbrelApiClient:
         try:
             await self._request("POST", "/trpc/system.update")
             return True
-        except Exception:
+        except Exception as e:
+            _LOGGER.error("Error starting system update: %s", e)
             return False
 
     async def get_update_status(self) -> dict:
@@ -124,11 +225,8 @@ class UmbrelApiClient:
             return False
 
     async def get_external_devices(self) -> list:
-        try:
-            response = await self._request("GET", "/trpc/files.externalDevices")
-            return response.get("result", {}).get("data", [])
-        except Exception:
-            return []
+        response = await self._request("GET", "/trpc/files.externalDevices")
+        return response.get("result", {}).get("data", [])
 
     async def get_backup_progress(self) -> list:
         try:
@@ -138,13 +236,8 @@ class UmbrelApiClient:
             return []
 
     async def get_apps(self) -> list:
-        try:
-            response = await self._request("GET", "/trpc/apps.list")
-            apps_list = response.get("result", {}).get("data", [])
-            return apps_list
-        except Exception as e:
-            _LOGGER.error("Error fetching apps: %s", e)
-            return []
+        response = await self._request("GET", "/trpc/apps.list")
+        return response.get("result", {}).get("data", [])
 
     async def get_app_state(self, app_id: str) -> dict:
         try:
@@ -174,12 +267,14 @@ class UmbrelApiClient:
         try:
             await self._request("POST", "/trpc/system.restart")
             return True
-        except Exception:
+        except Exception as e:
+            _LOGGER.error("Error rebooting Umbrel: %s", e)
             return False
 
     async def shutdown(self) -> bool:
         try:
             await self._request("POST", "/trpc/system.shutdown")
             return True
-        except Exception:
+        except Exception as e:
+            _LOGGER.error("Error shutting down Umbrel: %s", e)
             return False
\ No newline at end of file
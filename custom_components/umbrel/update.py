@@ -10,7 +10,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import CONF_POLL_UPDATES, DOMAIN
 from .coordinator import UmbrelCoordinator
 
 async def async_setup_entry(
@@ -20,7 +20,8 @@ async def async_setup_entry(
 ) -> None:
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities([UmbrelUpdateEntity(coordinator)])
+    if coordinator.polls(CONF_POLL_UPDATES):
+        async_add_entities([UmbrelUpdateEntity(coordinator)])
 
 class UmbrelUpdateEntity(CoordinatorEntity, UpdateEntity):
 
@@ -35,11 +36,11 @@ class UmbrelUpdateEntity(CoordinatorEntity, UpdateEntity):
 
     @property
     def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, "system")},
-            "name": "Umbrel System",
-            "manufacturer": "Umbrel",
-        }
+        return self.coordinator.device_info
+
+    @property
+    def unique_id(self) -> str:
+        return self.coordinator.unique_id(self._attr_unique_id)
 
     @property
     def installed_version(self) -> str | None: